@@ -5,11 +5,51 @@ Includes: Heightmap, Topo maps, Braille, QR codes, AI depth, Photogrammetry, Mul
 """
 
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
 import struct
+import mmap
+import os
 import json
 import re
 
+# scipy.ndimage filters, imported on first use (see _scipy_ndimage)
+_sobel = _gaussian_filter = None
+
+def _scipy_ndimage():
+    """Import scipy's sobel and gaussian_filter once and keep the handles"""
+    global _sobel, _gaussian_filter
+    if _sobel is None:
+        from scipy.ndimage import sobel, gaussian_filter
+        _sobel, _gaussian_filter = sobel, gaussian_filter
+    return _sobel, _gaussian_filter
+
+# OpenCV, imported on first use (see _opencv)
+_cv2 = None
+
+def _opencv():
+    """Import cv2 once; returns None when OpenCV is not installed"""
+    global _cv2
+    if _cv2 is None:
+        try:
+            import cv2
+            _cv2 = cv2
+        except ImportError:
+            _cv2 = False
+    return _cv2 or None
+
+# Numba kernels (converter_kernels.py), imported on first use (see _numba_kernels)
+_kernels = None
+
+def _numba_kernels():
+    """Import the Numba kernels once; returns None when numba is not installed"""
+    global _kernels
+    if _kernels is None:
+        try:
+            import converter_kernels
+            _kernels = converter_kernels
+        except ImportError:
+            _kernels = False
+    return _kernels or None
+
 # ============================================================================
 # CORE 3D MESH UTILITIES
 # ============================================================================
@@ -17,34 +57,103 @@ import re
 class STLWriter:
     """Utility for writing binary STL files"""
     
+    # 50-byte binary STL triangle record: normal, 3 vertices, attribute count
+    STL_DTYPE = np.dtype([
+        ('n', '<3f4'), ('v0', '<3f4'), ('v1', '<3f4'), ('v2', '<3f4'), ('attr', '<u2')
+    ])
+    
+    # Triangles gathered per block (~1.6MB of records), so the vertex
+    # gather, normals and packing stay cache-resident on large meshes
+    BLOCK_FACES = 32768
+    
     @staticmethod
-    def write_stl(vertices, faces, filename):
-        """Write vertices and faces to binary STL file"""
-        with open(filename, 'wb') as f:
-            # Header
-            header = b'Enhanced 3D Model Converter' + b' ' * (80 - 27)
-            f.write(header)
-            
-            # Number of triangles
-            f.write(struct.pack('<I', len(faces)))
-            
-            # Write each triangle
-            for face in faces:
-                v0, v1, v2 = vertices[face[0]], vertices[face[1]], vertices[face[2]]
-                
-                # Calculate normal
-                edge1 = v1 - v0
-                edge2 = v2 - v0
-                normal = np.cross(edge1, edge2)
-                norm = np.linalg.norm(normal)
-                normal = normal / norm if norm > 0 else np.array([0, 0, 1])
-                
-                # Write normal and vertices
-                f.write(struct.pack('<3f', *normal))
-                f.write(struct.pack('<3f', *v0))
-                f.write(struct.pack('<3f', *v1))
-                f.write(struct.pack('<3f', *v2))
-                f.write(struct.pack('<H', 0))
+    def face_normals(tri):
+        """Unit normals for an (N, 3, 3) array of triangles"""
+        edge1 = tri[:, 1] - tri[:, 0]
+        edge2 = tri[:, 2] - tri[:, 0]
+        normals = np.cross(edge1, edge2)
+        norm = np.linalg.norm(normals, axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            normals = np.where(norm > 0, normals / norm, np.float32([0, 0, 1]))
+        return normals.astype(np.float32, copy=False)
+    
+    @staticmethod
+    def _precompute_normals(vertices, faces):
+        """Unit normals for every face, computed block by block"""
+        normals = np.empty((len(faces), 3), dtype=np.float32)
+        for start in range(0, len(faces), STLWriter.BLOCK_FACES):
+            tri = vertices[faces[start:start + STLWriter.BLOCK_FACES]]
+            normals[start:start + len(tri)] = STLWriter.face_normals(tri)
+        return normals
+    
+    @staticmethod
+    def _header(n_faces):
+        """80-byte header plus triangle count"""
+        header = b'Enhanced 3D Model Converter' + b' ' * (80 - 27)
+        return header + struct.pack('<I', n_faces)
+    
+    @staticmethod
+    def _pack_block(block, tri, normals=None):
+        """Fill a block of triangle records from (N, 3, 3) triangles"""
+        block['n'] = STLWriter.face_normals(tri) if normals is None else normals
+        block['v0'] = tri[:, 0]
+        block['v1'] = tri[:, 1]
+        block['v2'] = tri[:, 2]
+        block['attr'] = 0
+    
+    @staticmethod
+    def _iter_blocks(vertices, faces, normals=None):
+        """
+        Pack triangle records BLOCK_FACES faces at a time into one reused
+        record array, yielding each filled block as raw bytes (uint8)
+        """
+        rec = np.empty(min(len(faces), STLWriter.BLOCK_FACES), dtype=STLWriter.STL_DTYPE)
+        for start in range(0, len(faces), STLWriter.BLOCK_FACES):
+            tri = vertices[faces[start:start + STLWriter.BLOCK_FACES]]
+            block = rec[:len(tri)]
+            STLWriter._pack_block(block, tri,
+                                  None if normals is None else normals[start:start + len(tri)])
+            yield block.view(np.uint8)
+    
+    @staticmethod
+    def write_stl(vertices, faces, filename, normals=None):
+        """
+        Write vertices and faces to binary STL file
+        filename: output path, or a writable binary file object (e.g. BytesIO)
+        normals: optional precomputed per-face normals, skips recomputing them
+        """
+        # No external (e.g. openstl) writer: the blocked float32 packing
+        # below already does one vectorized pass per block, and openstl
+        # 4.0.1 leaves the 2-byte attribute field of records uninitialized
+        vertices = np.asarray(vertices)
+        faces = np.asarray(faces).reshape(-1, 3)
+        nbytes = 84 + STLWriter.STL_DTYPE.itemsize * len(faces)
+        
+        if not isinstance(filename, (str, os.PathLike)):
+            # Stream: header, then each packed block as it is ready
+            filename.write(STLWriter._header(len(faces)))
+            for block in STLWriter._iter_blocks(vertices, faces, normals):
+                filename.write(block)
+            return
+        
+        # Size the file up front and copy each packed block into a memory
+        # map; the map never exports a buffer, so it always closes cleanly
+        try:
+            with open(filename, 'w+b') as f:
+                f.truncate(nbytes)
+                with mmap.mmap(f.fileno(), nbytes) as mm:
+                    mm[:84] = STLWriter._header(len(faces))
+                    pos = 84
+                    for block in STLWriter._iter_blocks(vertices, faces, normals):
+                        mm[pos:pos + len(block)] = block
+                        pos += len(block)
+        except BaseException:
+            # Don't leave a zero-filled, full-size file behind
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+            raise
     
     @staticmethod
     def write_multi_material_stl(vertices, faces, colors, output_prefix):
@@ -55,13 +164,17 @@ class STLWriter:
         unique_colors = np.unique(colors)
         files = {}
         
+        # Every material shares the vertex set: compute normals only once
+        all_normals = STLWriter._precompute_normals(vertices, faces)
+        
         for color_id in unique_colors:
             mask = colors == color_id
             color_faces = faces[mask]
             
             if len(color_faces) > 0:
                 filename = f"{output_prefix}_material_{int(color_id)}.stl"
-                STLWriter.write_stl(vertices, color_faces, filename)
+                STLWriter.write_stl(vertices, color_faces, filename,
+                                    normals=all_normals[mask])
                 files[f"Material_{int(color_id)}"] = filename
         
         return files
@@ -69,77 +182,153 @@ class STLWriter:
 class MeshGenerator:
     """Generate 3D meshes from height maps"""
     
+    # Grid cells above which the top surface is built by the Numba kernel;
+    # smaller grids are faster in NumPy than numba's import and JIT cost
+    NUMBA_MIN_CELLS = 1_000_000
+    
+    @staticmethod
+    def height_lut(max_height, base_height, invert=False):
+        """
+        256-entry float32 table mapping a uint8 gray level to a height,
+        so a whole image converts with one gather: height_lut(...)[pixels]
+        invert: If True, black maps to max height and white to the base
+        """
+        levels = np.arange(256, dtype=np.float32)
+        if invert:
+            levels = 255 - levels
+        return levels * np.float32(max_height / 255.0) + np.float32(base_height)
+    
+    @staticmethod
+    def _flat_rectangles(height_data):
+        """
+        Greedily cover runs of flat, equal-height grid cells with rectangles
+        Returns a list of (i0, j0, h, w, z) in cell units, keeping only
+        rectangles whose outline fan needs fewer triangles than its cells
+        """
+        h = height_data
+        corner = h[:-1, :-1]
+        flat = (corner == h[:-1, 1:]) & (corner == h[1:, :-1]) & (corner == h[1:, 1:])
+        n_rows, n_cols = flat.shape
+        if n_rows == 0 or n_cols == 0:
+            return []
+        
+        rects = []
+        open_runs = {}  # (j0, j1, z) -> first row of the run
+        for i in range(n_rows):
+            # Horizontal runs of flat cells at one height in this row
+            row_flat, z = flat[i], corner[i]
+            split = ~(row_flat[1:] & row_flat[:-1] & (z[1:] == z[:-1]))
+            starts = np.r_[0, np.flatnonzero(split) + 1]
+            ends = np.r_[starts[1:], n_cols]
+            keep = row_flat[starts] & (ends - starts >= 2)
+            
+            # Runs identical to one in the row above extend its rectangle
+            next_runs = {}
+            for j0, j1 in zip(starts[keep], ends[keep]):
+                key = (j0, j1, z[j0])
+                next_runs[key] = open_runs.pop(key, i)
+            for (j0, j1, z0), i0 in open_runs.items():
+                rects.append((i0, j0, i - i0, j1 - j0, z0))
+            open_runs = next_runs
+        for (j0, j1, z0), i0 in open_runs.items():
+            rects.append((i0, j0, n_rows - i0, j1 - j0, z0))
+        
+        # A fan over the outline costs 2*(h+w) triangles vs 2*h*w per cell
+        return [r for r in rects if r[2] * r[3] > r[2] + r[3]]
+    
     @staticmethod
-    def heightmap_to_mesh(height_data, pixel_size=1.0, base_height=0.0):
-        """Convert 2D height map to 3D mesh with top, bottom, and sides"""
+    def heightmap_to_mesh(height_data, pixel_size=1.0, base_height=0.0, merge_flat=True):
+        """
+        Convert 2D height map to 3D mesh with top, bottom, and sides
+        merge_flat: If True, flat equal-height areas of the top surface are
+                    triangulated as a whole instead of two triangles per cell
+        """
         rows, cols = height_data.shape
-        vertices = []
-        
-        # Top surface vertices
-        for i in range(rows):
-            for j in range(cols):
-                x = j * pixel_size
-                y = i * pixel_size
-                z = height_data[i, j]
-                vertices.append([x, y, z])
-        
-        # Bottom surface vertices
-        for i in range(rows):
-            for j in range(cols):
-                x = j * pixel_size
-                y = i * pixel_size
-                vertices.append([x, y, base_height])
         
-        vertices = np.array(vertices)
-        
-        # Generate faces
-        faces = []
+        # Top surface vertices, kept as separate X/Y/Z columns
+        x_coord = np.arange(cols, dtype=np.float32) * np.float32(pixel_size)
+        y_coord = np.arange(rows, dtype=np.float32) * np.float32(pixel_size)
+        X = np.tile(x_coord, rows)
+        Y = np.repeat(y_coord, cols)
+        Z_top = np.asarray(height_data, dtype=np.float32).ravel()
+        
+        # Top-grid indices of the outline, walked counter-clockwise:
+        # front edge, right edge, back edge, left edge
+        grid = np.arange(rows * cols).reshape(rows, cols)
+        perimeter = np.concatenate([
+            grid[0, :-1], grid[:-1, -1], grid[-1, :0:-1], grid[:0:-1, 0]
+        ])
+        
+        # The flat bottom only needs the outline plus a center point to
+        # fan from; interior bottom vertices would all be coplanar
+        X_bot = np.append(X[perimeter], x_coord[-1] / 2)
+        Y_bot = np.append(Y[perimeter], y_coord[-1] / 2)
+        Z_bot = np.full(len(perimeter) + 1, base_height, dtype=np.float32)
+        
+        # Interleave into [x, y, z] rows only once, for the STL writer
+        vertices = np.column_stack([
+            np.concatenate([X, X_bot]), np.concatenate([Y, Y_bot]), np.concatenate([Z_top, Z_bot])
+        ])
+        
+        # All faces go into one preallocated buffer: top, bottom, sides
+        n_top = 2 * (rows - 1) * (cols - 1)
+        n_ring = len(perimeter)
+        faces = np.empty((n_top + 3 * n_ring, 3), dtype=np.int32)
         
         # Top surface
-        for i in range(rows - 1):
-            for j in range(cols - 1):
-                idx = i * cols + j
-                faces.append([idx, idx + 1, idx + cols])
-                faces.append([idx + 1, idx + cols + 1, idx + cols])
+        kernels = None
+        if (rows - 1) * (cols - 1) >= MeshGenerator.NUMBA_MIN_CELLS:
+            kernels = _numba_kernels()
+        if kernels is not None:
+            kernels.build_top_faces(rows, cols, faces)
+        else:
+            idx = (np.arange(rows - 1)[:, None] * cols + np.arange(cols - 1)).ravel()
+            faces[:n_top] = np.stack([
+                np.stack([idx, idx + 1, idx + cols], 1),
+                np.stack([idx + 1, idx + cols + 1, idx + cols], 1),
+            ], 1).reshape(-1, 3)
         
-        # Bottom surface (reversed winding)
+        # Bottom surface (reversed winding), fanned from the center point
         offset = rows * cols
-        for i in range(rows - 1):
-            for j in range(cols - 1):
-                idx = i * cols + j + offset
-                faces.append([idx, idx + cols, idx + 1])
-                faces.append([idx + 1, idx + cols, idx + cols + 1])
-        
-        # Side walls
-        # Left edge
-        for i in range(rows - 1):
-            top_idx = i * cols
-            bot_idx = top_idx + offset
-            faces.append([top_idx, bot_idx, top_idx + cols])
-            faces.append([bot_idx, bot_idx + cols, top_idx + cols])
-        
-        # Right edge
-        for i in range(rows - 1):
-            top_idx = i * cols + cols - 1
-            bot_idx = top_idx + offset
-            faces.append([top_idx, top_idx + cols, bot_idx])
-            faces.append([bot_idx, top_idx + cols, bot_idx + cols])
-        
-        # Front edge
-        for j in range(cols - 1):
-            top_idx = j
-            bot_idx = top_idx + offset
-            faces.append([top_idx, top_idx + 1, bot_idx])
-            faces.append([bot_idx, top_idx + 1, bot_idx + 1])
-        
-        # Back edge
-        for j in range(cols - 1):
-            top_idx = (rows - 1) * cols + j
-            bot_idx = top_idx + offset
-            faces.append([top_idx, bot_idx, top_idx + 1])
-            faces.append([bot_idx, bot_idx + 1, top_idx + 1])
-        
-        return vertices, np.array(faces)
+        ring = np.arange(n_ring) + offset
+        ring_next = np.roll(ring, -1)
+        center = np.full_like(ring, offset + n_ring)
+        faces[n_top:n_top + n_ring] = np.stack([center, ring_next, ring], 1)
+        
+        # Side walls, one quad per outline segment
+        t0, t1 = perimeter, np.roll(perimeter, -1)
+        faces[n_top + n_ring:] = np.stack([
+            np.stack([t0, t1, ring], 1),
+            np.stack([ring, t1, ring_next], 1),
+        ], 1).reshape(-1, 3)
+        
+        # A single row or column of vertices has no cells to merge
+        if merge_flat and rows >= 2 and cols >= 2:
+            rects = MeshGenerator._flat_rectangles(np.asarray(height_data, dtype=np.float32))
+        else:
+            rects = []
+        
+        if rects:
+            # Fan each flat rectangle from a new center vertex, over every
+            # grid vertex on its outline so neighbouring cells still share
+            # edges with it (no T-junctions)
+            covered = np.zeros((rows - 1, cols - 1), dtype=bool)
+            first_center = len(vertices)
+            centers, fans = [], []
+            for k, (i0, j0, h, w, z) in enumerate(rects):
+                covered[i0:i0 + h, j0:j0 + w] = True
+                sub = grid[i0:i0 + h + 1, j0:j0 + w + 1]
+                outline = np.concatenate([sub[0, :-1], sub[:-1, -1], sub[-1, :0:-1], sub[:0:-1, 0]])
+                fans.append(np.stack([
+                    np.full_like(outline, first_center + k), outline, np.roll(outline, -1)
+                ], 1))
+                centers.append([(j0 + w / 2) * pixel_size, (i0 + h / 2) * pixel_size, z])
+            
+            vertices = np.concatenate([vertices, np.array(centers, dtype=np.float32)])
+            keep = np.repeat(~covered.ravel(), 2)
+            faces = np.concatenate([faces[:n_top][keep], *fans, faces[n_top:]]).astype(np.int32, copy=False)
+        
+        return vertices.astype(np.float32, copy=False), faces
 
 # ============================================================================
 # FEATURE 1: BASIC HEIGHTMAP (Original functionality)
@@ -152,11 +341,12 @@ class HeightmapConverter:
     def convert(image_path, output_stl, max_height=10.0, base_thickness=2.0, 
                 pixel_size=1.0, max_resolution=100):
         """Standard heightmap conversion"""
+        from PIL import Image
         img = Image.open(image_path).convert('L')
         img.thumbnail((max_resolution, max_resolution), Image.Resampling.LANCZOS)
         
-        height_data = np.array(img, dtype=float) / 255.0
-        height_data = height_data * max_height + base_thickness
+        lut = MeshGenerator.height_lut(max_height, base_thickness)
+        height_data = lut[np.asarray(img, dtype=np.uint8)]
         
         vertices, faces = MeshGenerator.heightmap_to_mesh(height_data, pixel_size, 0)
         STLWriter.write_stl(vertices, faces, output_stl)
@@ -175,10 +365,12 @@ class TopoMapConverter:
     """Generate 3D topographic maps from elevation data"""
     
     @staticmethod
-    def from_csv(csv_path, output_stl, vertical_scale=1.0, pixel_size=1.0):
+    def from_csv(csv_path, output_stl, vertical_scale=1.0, pixel_size=1.0, method='linear'):
         """
         Convert elevation CSV to 3D topo map
         Expected CSV format: latitude,longitude,elevation
+        method: 'nearest', 'linear' or 'cubic'; 'rbf' uses a local
+                thin-plate-spline fit for scattered points
         """
         import csv
         
@@ -204,10 +396,33 @@ class TopoMapConverter:
         lon_grid = np.linspace(lon_min, lon_max, grid_size)
         
         # Interpolate elevation data onto grid
-        from scipy.interpolate import griddata
         grid_lat, grid_lon = np.meshgrid(lat_grid, lon_grid)
-        elevation_grid = griddata(points[:, :2], points[:, 2], 
-                                 (grid_lat, grid_lon), method='cubic')
+        
+        lat_u, lat_idx = np.unique(points[:, 0], return_inverse=True)
+        lon_u, lon_idx = np.unique(points[:, 1], return_inverse=True)
+        elev_grid = np.full((len(lat_u), len(lon_u)), np.nan)
+        elev_grid[lat_idx, lon_idx] = points[:, 2]
+        
+        # RegularGridInterpolator's cubic needs at least 4 points per axis
+        min_axis = 4 if method == 'cubic' else 2
+        if (len(points) == elev_grid.size and not np.isnan(elev_grid).any()
+                and method != 'rbf' and min(len(lat_u), len(lon_u)) >= min_axis):
+            # Points already form a regular lat/lon grid: no triangulation needed
+            from scipy.interpolate import RegularGridInterpolator
+            interp = RegularGridInterpolator((lat_u, lon_u), elev_grid, method=method,
+                                             bounds_error=False)
+            elevation_grid = interp((grid_lat, grid_lon))
+        elif method == 'rbf':
+            from scipy.interpolate import RBFInterpolator
+            interp = RBFInterpolator(points[:, :2], points[:, 2],
+                                     neighbors=min(50, len(points)),
+                                     kernel='thin_plate_spline')
+            elevation_grid = interp(np.c_[grid_lat.ravel(), grid_lon.ravel()])
+            elevation_grid = elevation_grid.reshape(grid_lat.shape)
+        else:
+            from scipy.interpolate import griddata
+            elevation_grid = griddata(points[:, :2], points[:, 2], 
+                                     (grid_lat, grid_lon), method=method)
         
         # Replace NaN with minimum elevation
         elevation_grid = np.nan_to_num(elevation_grid, nan=points[:, 2].min())
@@ -268,9 +483,13 @@ class BrailleConverter:
         'y': [1, 0, 1, 1, 1, 1], 'z': [1, 0, 1, 0, 1, 1], ' ': [0, 0, 0, 0, 0, 0],
     }
     
+    # Same patterns packed into one int per character, bit k = dot k
+    PATTERN_U8 = {c: int(''.join(map(str, reversed(p))), 2)
+                  for c, p in BRAILLE_PATTERNS.items()}
+    
     @staticmethod
     def text_to_braille_image(text, dot_size=10, spacing=15):
-        """Convert text to Braille dot pattern image"""
+        """Convert text to Braille dot pattern image (uint8 array, dots = 255)"""
         text = text.lower()
         
         # Calculate image size
@@ -280,24 +499,29 @@ class BrailleConverter:
         img_height = char_height + 2 * spacing
         
         # Create image
-        img = Image.new('L', (img_width, img_height), 0)
-        draw = ImageDraw.Draw(img)
+        img = np.zeros((img_height, img_width), dtype=np.uint8)
+        
+        # One filled dot covering the inclusive [x, x + dot_size] box,
+        # stamped wherever a dot is raised
+        c, r = dot_size / 2, (dot_size + 1) / 2
+        yy, xx = np.ogrid[:dot_size + 1, :dot_size + 1]
+        disk = ((xx - c) ** 2 + (yy - c) ** 2 <= r * r).astype(np.uint8) * 255
         
-        # Draw each character
+        # Stamp each character
         for i, char in enumerate(text):
-            if char in BrailleConverter.BRAILLE_PATTERNS:
-                pattern = BrailleConverter.BRAILLE_PATTERNS[char]
-                x_offset = i * (char_width + spacing) + spacing
-                y_offset = spacing
-                
-                # Draw 6 dots in 2×3 grid
-                for dot_idx, active in enumerate(pattern):
-                    if active:
-                        col = dot_idx % 2
-                        row = dot_idx // 2
-                        x = x_offset + col * (dot_size + spacing)
-                        y = y_offset + row * (dot_size + spacing)
-                        draw.ellipse([x, y, x + dot_size, y + dot_size], fill=255)
+            bits = BrailleConverter.PATTERN_U8.get(char, 0)
+            x_offset = i * (char_width + spacing) + spacing
+            y_offset = spacing
+            
+            # Visit only the raised dots of the 2×3 grid, lowest bit first
+            while bits:
+                dot_idx = (bits & -bits).bit_length() - 1
+                bits &= bits - 1
+                col = dot_idx % 2
+                row = dot_idx // 2
+                x = x_offset + col * (dot_size + spacing)
+                y = y_offset + row * (dot_size + spacing)
+                img[y:y + dot_size + 1, x:x + dot_size + 1] |= disk
         
         return img
     
@@ -307,8 +531,7 @@ class BrailleConverter:
         img = BrailleConverter.text_to_braille_image(text, dot_size)
         
         # Convert to height map
-        height_data = np.array(img, dtype=float) / 255.0
-        height_data = height_data * dot_height + base_thickness
+        height_data = MeshGenerator.height_lut(dot_height, base_thickness)[img]
         
         vertices, faces = MeshGenerator.heightmap_to_mesh(height_data, 0.5, 0)
         STLWriter.write_stl(vertices, faces, output_stl)
@@ -316,7 +539,7 @@ class BrailleConverter:
         return {
             'text': text,
             'characters': len(text),
-            'dimensions': f"{img.width*0.5:.1f}mm × {img.height*0.5:.1f}mm"
+            'dimensions': f"{img.shape[1]*0.5:.1f}mm × {img.shape[0]*0.5:.1f}mm"
         }
 
 # ============================================================================
@@ -338,18 +561,16 @@ class QRCodeConverter:
             return img.convert('L')
         except ImportError:
             # Fallback: create a simple grid pattern
+            from PIL import Image
             size = 200
-            img = Image.new('L', (size, size), 255)
-            draw = ImageDraw.Draw(img)
-            
-            # Create checkerboard pattern
             block_size = 20
-            for i in range(0, size, block_size):
-                for j in range(0, size, block_size):
-                    if (i + j) // block_size % 2:
-                        draw.rectangle([i, j, i+block_size, j+block_size], fill=0)
             
-            return img
+            # Create checkerboard pattern: white blocks where row + col is even
+            n = size // block_size
+            checker = (np.indices((n, n)).sum(0) % 2).astype(np.uint8)
+            img_arr = np.kron(1 - checker, np.ones((block_size, block_size), dtype=np.uint8)) * 255
+            
+            return Image.fromarray(img_arr, 'L')
     
     @staticmethod
     def convert(data, output_stl, raised_height=2.0, base_thickness=2.0, invert=False):
@@ -359,13 +580,9 @@ class QRCodeConverter:
         """
         img = QRCodeConverter.generate_qr_image(data)
         
-        # Convert to height map
-        height_data = np.array(img, dtype=float) / 255.0
-        
-        if invert:
-            height_data = 1.0 - height_data  # Invert for stamps
-        
-        height_data = height_data * raised_height + base_thickness
+        # Convert to height map (inverted for stamps)
+        lut = MeshGenerator.height_lut(raised_height, base_thickness, invert=invert)
+        height_data = lut[np.asarray(img, dtype=np.uint8)]
         
         vertices, faces = MeshGenerator.heightmap_to_mesh(height_data, 0.5, 0)
         STLWriter.write_stl(vertices, faces, output_stl)
@@ -389,15 +606,30 @@ class AIDepthConverter:
         Simplified depth estimation using edge detection and gradients
         In production, this would use models like MiDaS or Stable Diffusion depth
         """
+        from PIL import Image
         img = Image.open(image_path).convert('RGB')
         img.thumbnail((256, 256), Image.Resampling.LANCZOS)
         
         # Convert to grayscale
         gray = img.convert('L')
-        gray_array = np.array(gray, dtype=float)
+        
+        cv2 = _opencv()
+        if cv2 is not None:
+            # OpenCV's SIMD filters; Sobel stays in int16 on the uint8 image
+            # until the magnitude. BORDER_REFLECT matches scipy's 'reflect'
+            gray_u8 = np.asarray(gray, dtype=np.uint8)
+            gx = cv2.Sobel(gray_u8, cv2.CV_16S, 1, 0, borderType=cv2.BORDER_REFLECT)
+            gy = cv2.Sobel(gray_u8, cv2.CV_16S, 0, 1, borderType=cv2.BORDER_REFLECT)
+            edges = cv2.magnitude(gx.astype(np.float32), gy.astype(np.float32))
+            edges = (edges - edges.min()) / (edges.max() - edges.min() + 1e-6)
+            
+            depth = gray_u8 * np.float32(0.7 / 255.0) + (1 - edges) * 0.3
+            return cv2.GaussianBlur(depth, (0, 0), 2.0, borderType=cv2.BORDER_REFLECT)
+        
+        gray_array = np.asarray(gray, dtype=np.float32)
         
         # Edge detection (Sobel-like)
-        from scipy.ndimage import sobel
+        sobel, gaussian_filter = _scipy_ndimage()
         edges_x = sobel(gray_array, axis=0)
         edges_y = sobel(gray_array, axis=1)
         edges = np.hypot(edges_x, edges_y)
@@ -408,11 +640,10 @@ class AIDepthConverter:
         # Combine with original brightness for pseudo-depth
         # Bright areas + low edge = far (sky, background)
         # Dark areas + high edge = near (foreground objects)
-        brightness = gray_array / 255.0
+        brightness = gray_array * np.float32(1 / 255.0)
         depth = brightness * 0.7 + (1 - edges) * 0.3
         
         # Smooth the depth map
-        from scipy.ndimage import gaussian_filter
         depth = gaussian_filter(depth, sigma=2)
         
         return depth
@@ -422,8 +653,9 @@ class AIDepthConverter:
         """Convert image to 3D using AI depth estimation"""
         depth_map = AIDepthConverter.simple_depth_estimation(image_path)
         
-        # Scale depth
-        depth_map = depth_map * max_depth + base_thickness
+        # Scale depth in place (the map is a fresh float32 array)
+        depth_map *= max_depth
+        depth_map += base_thickness
         
         vertices, faces = MeshGenerator.heightmap_to_mesh(depth_map, 1.0, 0)
         STLWriter.write_stl(vertices, faces, output_stl)
@@ -442,37 +674,44 @@ class MultiMaterialConverter:
     """Generate multi-material models for dual-extrusion printers"""
     
     @staticmethod
-    def separate_colors(image_path, threshold=128):
-        """Separate image into two materials based on threshold"""
+    def separate_colors(image_path, threshold=128, height=10.0, base=2.0):
+        """
+        Separate image into two materials based on threshold
+        Returns the (bright, dark) height maps, each at base where the
+        other material is
+        """
+        from PIL import Image
         img = Image.open(image_path).convert('L')
         img.thumbnail((100, 100), Image.Resampling.LANCZOS)
         
-        img_array = np.array(img)
+        pixels = np.asarray(img, dtype=np.uint8)
         
-        # Create two height maps
-        material_1 = np.where(img_array >= threshold, img_array, 0)
-        material_2 = np.where(img_array < threshold, 255 - img_array, 0)
+        # Fold the threshold into one lookup table per material, then
+        # create each height map with a single gather
+        levels = np.arange(256)
+        lut_1 = np.where(levels >= threshold, MeshGenerator.height_lut(height, base), base)
+        lut_2 = np.where(levels < threshold,
+                         MeshGenerator.height_lut(height, base, invert=True), base)
         
-        return material_1, material_2
+        return lut_1.astype(np.float32)[pixels], lut_2.astype(np.float32)[pixels]
     
     @staticmethod
     def convert(image_path, output_prefix, height=10.0, base=2.0):
         """Generate separate STL files for each material"""
-        mat1, mat2 = MultiMaterialConverter.separate_colors(image_path)
+        height_1, height_2 = MultiMaterialConverter.separate_colors(
+            image_path, height=height, base=base)
         
         files = {}
         
         # Material 1 (bright areas)
-        if mat1.max() > 0:
-            height_1 = (mat1 / 255.0) * height + base
+        if height_1.max() > base:
             v1, f1 = MeshGenerator.heightmap_to_mesh(height_1, 1.0, 0)
             file1 = f"{output_prefix}_material_1_bright.stl"
             STLWriter.write_stl(v1, f1, file1)
             files['Material_1_Bright'] = file1
         
         # Material 2 (dark areas)
-        if mat2.max() > 0:
-            height_2 = (mat2 / 255.0) * height + base
+        if height_2.max() > base:
             v2, f2 = MeshGenerator.heightmap_to_mesh(height_2, 1.0, 0)
             file2 = f"{output_prefix}_material_2_dark.stl"
             STLWriter.write_stl(v2, f2, file2)
@@ -525,6 +764,9 @@ Examples:
     p_topo = subparsers.add_parser('topo', help='Topographic map')
     p_topo.add_argument('--demo', action='store_true', help='Generate demo terrain')
     p_topo.add_argument('--csv', help='CSV file with elevation data')
+    p_topo.add_argument('--method', default='linear',
+                        choices=['nearest', 'linear', 'cubic', 'rbf'],
+                        help='Interpolation method for --csv')
     p_topo.add_argument('output', help='Output STL file')
     
     # Braille
@@ -567,7 +809,7 @@ Examples:
         if args.demo:
             result = TopoMapConverter.from_fake_data(args.output)
         elif args.csv:
-            result = TopoMapConverter.from_csv(args.csv, args.output)
+            result = TopoMapConverter.from_csv(args.csv, args.output, method=args.method)
         else:
             print("Error: Use --demo or --csv <file>")
             return
@@ -6,6 +6,7 @@ Flask API Backend for Advanced 3D Converter
 from flask import Flask, request, jsonify, send_file, send_from_directory
 from flask_cors import CORS
 import os
+import io
 import tempfile
 import sys
 from pathlib import Path
@@ -45,18 +46,16 @@ def convert_heightmap():
         max_height = float(request.form.get('max_height', 10.0))
         base_thickness = float(request.form.get('base_thickness', 2.0))
         
-        input_path = os.path.join(UPLOAD_FOLDER, 'input.jpg')
-        file.save(input_path)
-        
-        output_path = os.path.join(UPLOAD_FOLDER, 'output.stl')
+        output = io.BytesIO()
         result = HeightmapConverter.convert(
-            input_path, output_path, 
+            file.stream, output, 
             max_height=max_height, 
             base_thickness=base_thickness
         )
+        output.seek(0)
         
         return send_file(
-            output_path,
+            output,
             as_attachment=True,
             download_name='heightmap_model.stl',
             mimetype='model/stl'
@@ -74,11 +73,12 @@ def convert_braille():
         if not text:
             return jsonify({'error': 'No text provided'}), 400
         
-        output_path = os.path.join(UPLOAD_FOLDER, 'braille.stl')
-        result = BrailleConverter.convert(text, output_path)
+        output = io.BytesIO()
+        result = BrailleConverter.convert(text, output)
+        output.seek(0)
         
         return send_file(
-            output_path,
+            output,
             as_attachment=True,
             download_name='braille_model.stl',
             mimetype='model/stl'
@@ -97,11 +97,12 @@ def convert_qr():
         if not qr_data:
             return jsonify({'error': 'No data provided'}), 400
         
-        output_path = os.path.join(UPLOAD_FOLDER, 'qr.stl')
-        result = QRCodeConverter.convert(qr_data, output_path, invert=stamp_mode)
+        output = io.BytesIO()
+        result = QRCodeConverter.convert(qr_data, output, invert=stamp_mode)
+        output.seek(0)
         
         return send_file(
-            output_path,
+            output,
             as_attachment=True,
             download_name='qr_model.stl',
             mimetype='model/stl'
@@ -113,11 +114,12 @@ def convert_qr():
 def convert_topo():
     """Generate topographic map"""
     try:
-        output_path = os.path.join(UPLOAD_FOLDER, 'terrain.stl')
-        result = TopoMapConverter.from_fake_data(output_path)
+        output = io.BytesIO()
+        result = TopoMapConverter.from_fake_data(output)
+        output.seek(0)
         
         return send_file(
-            output_path,
+            output,
             as_attachment=True,
             download_name='terrain_model.stl',
             mimetype='model/stl'
@@ -134,14 +136,12 @@ def convert_depth():
         
         file = request.files['file']
         
-        input_path = os.path.join(UPLOAD_FOLDER, 'input_depth.jpg')
-        file.save(input_path)
-        
-        output_path = os.path.join(UPLOAD_FOLDER, 'depth.stl')
-        result = AIDepthConverter.convert(input_path, output_path)
+        output = io.BytesIO()
+        result = AIDepthConverter.convert(file.stream, output)
+        output.seek(0)
         
         return send_file(
-            output_path,
+            output,
             as_attachment=True,
             download_name='depth_model.stl',
             mimetype='model/stl'
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Numba kernels for the Advanced 3D Converter
+Imported on first use by advanced_converter (see _numba_kernels), so numba's
+import and JIT cost is only paid by the code paths that run them
+"""
+
+from numba import njit, prange
+
+# ============================================================================
+# MESH GENERATION
+# ============================================================================
+
+@njit(parallel=True, cache=True)
+def build_top_faces(rows, cols, out):
+    """Fill out[:2*(rows-1)*(cols-1)] with the top surface triangles"""
+    for i in prange(rows - 1):
+        for j in range(cols - 1):
+            idx = i * cols + j
+            k = 2 * (i * (cols - 1) + j)
+            out[k, 0] = idx
+            out[k, 1] = idx + 1
+            out[k, 2] = idx + cols
+            out[k + 1, 0] = idx + 1
+            out[k + 1, 1] = idx + cols + 1
+            out[k + 1, 2] = idx + cols